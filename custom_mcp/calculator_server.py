@@ -5,33 +5,110 @@ Simple MCP Calculator Server
 This is a standalone MCP server that provides calculator tools and listens on HTTP.
 """
 
+import asyncio
 import json
+import logging
+from functools import lru_cache
+import operator
+import os
 import sys
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List
 
+from aiohttp import web
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+def json_loads(data):
+    """Parse JSON from bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+def json_dumps(obj):
+    """Serialize an object to JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+_numpy = None
+
+def load_numpy():
+    """Import numpy on first use, so scalar calls never pay the import cost."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+# Schemas for the batch tools, which take arrays instead of scalars
+BATCH_PARAMETERS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "a": {
+            "type": "array",
+            "items": {"type": "number"},
+            "description": "First array of numbers"
+        },
+        "b": {
+            "type": "array",
+            "items": {"type": "number"},
+            "description": "Second array of numbers"
+        }
+    },
+    "required": ["a", "b"]
+}
+
+BATCH_RETURN_SCHEMA = {
+    "type": "array",
+    "items": {"type": "number"},
+    "description": "The element-wise calculation results"
+}
+
 # Server configuration
 HOST = "localhost"
 PORT = 8000
 SERVER_NAME = "MCP Calculator Server"
 SERVER_VERSION = "1.0.0"
 
+# Upper bound on request body size; bounds the memory a client can make
+# the server allocate for a single request.
+MAX_BODY_BYTES = 1 << 20  # 1 MiB
+
+# Debug logging is disabled by default; set the level to DEBUG to get the
+# per-request traces. Formatting is deferred, so disabled logging costs a
+# single level check per call.
+log = logging.getLogger("mcp")
+log.setLevel(logging.WARNING)
+
 class MCPTool:
     """Represents a tool exposed by the MCP server."""
-    
-    def __init__(self, tool_id, name, description, handler_func):
+
+    # Fixed attribute layout: no per-instance __dict__, so attribute
+    # access is a direct slot lookup and each tool is lighter in memory.
+    __slots__ = ("id", "name", "description", "handler", "_dict")
+
+    def __init__(self, tool_id, name, description, handler_func,
+                 parameters_schema=None, return_schema=None):
         self.id = tool_id
         self.name = name
         self.description = description
         self.handler = handler_func
-        
-    def to_dict(self):
-        """Convert the tool to its dictionary representation."""
-        return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "parameters_schema": {
+        if parameters_schema is None:
+            parameters_schema = {
                 "type": "object",
                 "properties": {
                     "a": {
@@ -44,13 +121,26 @@ class MCPTool:
                     }
                 },
                 "required": ["a", "b"]
-            },
-            "return_schema": {
+            }
+        if return_schema is None:
+            return_schema = {
                 "type": "number",
                 "description": "The calculation result"
             }
+        # Tools are immutable after registration, so the dictionary
+        # representation can be built once here instead of per request.
+        self._dict = {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "parameters_schema": parameters_schema,
+            "return_schema": return_schema
         }
 
+    def to_dict(self):
+        """Convert the tool to its dictionary representation."""
+        return self._dict
+
 class MCPCalculatorServer:
     """A simple MCP server that provides calculator functionality."""
     
@@ -70,31 +160,103 @@ class MCPCalculatorServer:
             "Subtract the second number from the first",
             self.subtract
         )
-        
-    def register_tool(self, tool_id, name, description, handler):
+        self.register_tool(
+            "calculator:add_batch",
+            "add_batch",
+            "Add two equal-length arrays of numbers element-wise",
+            self.add_batch,
+            parameters_schema=BATCH_PARAMETERS_SCHEMA,
+            return_schema=BATCH_RETURN_SCHEMA
+        )
+        self.register_tool(
+            "calculator:subtract_batch",
+            "subtract_batch",
+            "Subtract the second array from the first element-wise",
+            self.subtract_batch,
+            parameters_schema=BATCH_PARAMETERS_SCHEMA,
+            return_schema=BATCH_RETURN_SCHEMA
+        )
+        # Tools are registered once at startup, so the tools/list payload
+        # can be built a single time instead of on every request.
+        self._tools_list_cached = [tool.to_dict() for tool in self.tools.values()]
+        # Method dispatch table: a single dict lookup per request instead
+        # of an if/elif chain that grows with every new method.
+        self._dispatch = {
+            "initialize": lambda _params: self.handle_initialize(),
+            "tools/list": lambda _params: self.handle_list_tools(),
+            "tools/execute": self.handle_execute_tool,
+            "tools/invalidate": lambda _params: self.handle_invalidate_cache(),
+        }
+        # The calculator tools are deterministic, so repeated scalar calls
+        # can be answered from a bounded cache instead of re-executed.
+        # typed=True keys int and float operands separately, so a cached
+        # add(2, 3) -> 5 never masks add(2.0, 3.0) -> 5.0.
+        self._cached_execute = lru_cache(maxsize=1024, typed=True)(self._execute_scalar)
+
+    def register_tool(self, tool_id, name, description, handler,
+                      parameters_schema=None, return_schema=None):
         """Register a new tool with the server."""
-        self.tools[tool_id] = MCPTool(tool_id, name, description, handler)
-        
+        self.tools[tool_id] = MCPTool(tool_id, name, description, handler,
+                                      parameters_schema, return_schema)
+        self._tools_list_cached = None  # Invalidate the cached tools/list payload
+
+    # Fetches both operands in one call, halving the dict lookups per
+    # operation and keeping the missing-parameter branch off the fast path.
+    _get_ab = operator.itemgetter("a", "b")
+
     def add(self, params):
         """Add two numbers."""
-        if "a" not in params or "b" not in params:
+        try:
+            a, b = self._get_ab(params)
+        except KeyError:
             raise ValueError("Missing required parameters: 'a' and 'b'")
-            
-        a = params["a"]
-        b = params["b"]
+
         result = a + b
-        print(f"[DEBUG] Addition: {a} + {b} = {result}", file=sys.stderr)
+        log.debug("Addition: %s + %s = %s", a, b, result)
         return result
         
     def subtract(self, params):
         """Subtract b from a."""
-        if "a" not in params or "b" not in params:
+        try:
+            a, b = self._get_ab(params)
+        except KeyError:
             raise ValueError("Missing required parameters: 'a' and 'b'")
-            
-        a = params["a"]
-        b = params["b"]
+
         result = a - b
-        print(f"[DEBUG] Subtraction: {a} - {b} = {result}", file=sys.stderr)
+        log.debug("Subtraction: %s - %s = %s", a, b, result)
+        return result
+
+    def add_batch(self, params):
+        """Add two arrays of numbers element-wise."""
+        return self._batch_op(params, operator.add)
+
+    def subtract_batch(self, params):
+        """Subtract the second array from the first element-wise."""
+        return self._batch_op(params, operator.sub)
+
+    def _batch_op(self, params, op):
+        """Apply a binary operation across two equal-length arrays.
+
+        Uses NumPy when available so N elements cost one vectorized call
+        instead of N Python-level operations; falls back to a plain loop.
+        """
+        try:
+            a, b = self._get_ab(params)
+        except KeyError:
+            raise ValueError("Missing required parameters: 'a' and 'b'")
+
+        if not isinstance(a, list) or not isinstance(b, list):
+            raise ValueError("Batch parameters 'a' and 'b' must be arrays")
+        if len(a) != len(b):
+            raise ValueError("Batch parameters 'a' and 'b' must have the same length")
+
+        np = load_numpy()
+        if np is not None:
+            result = op(np.asarray(a, dtype=np.float64),
+                        np.asarray(b, dtype=np.float64)).tolist()
+        else:
+            result = [op(x, y) for x, y in zip(a, b)]
+        log.debug("Batch operation on %d elements", len(result))
         return result
     
     def handle_initialize(self):
@@ -123,11 +285,14 @@ class MCPCalculatorServer:
     
     def handle_list_tools(self):
         """Handle a tools/list request."""
-        print(f"[DEBUG] Tools Discovery - Returning {len(self.tools)} tools", file=sys.stderr)
-        for tool_id, tool in self.tools.items():
-            print(f"[DEBUG]   - {tool_id}: {tool.description}", file=sys.stderr)
-            
-        return [tool.to_dict() for tool in self.tools.values()]
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Tools Discovery - Returning %d tools", len(self.tools))
+            for tool_id, tool in self.tools.items():
+                log.debug("  - %s: %s", tool_id, tool.description)
+
+        if self._tools_list_cached is None:
+            self._tools_list_cached = [tool.to_dict() for tool in self.tools.values()]
+        return self._tools_list_cached
     
     def handle_execute_tool(self, params):
         """Handle a tools/execute request."""
@@ -139,131 +304,143 @@ class MCPCalculatorServer:
             raise ValueError(f"Unknown tool: {tool_id}")
             
         tool_params = params.get("parameters", {})
-        print(f"[DEBUG] Executing tool: {tool_id}", file=sys.stderr)
-        print(f"[DEBUG] Parameters: {json.dumps(tool_params)}", file=sys.stderr)
-        
-        result = self.tools[tool_id].handler(tool_params)
-        print(f"[DEBUG] Result: {result}", file=sys.stderr)
+        log.debug("Executing tool: %s", tool_id)
+        # The params were just parsed from the request body; log the dict
+        # as-is rather than paying a JSON re-serialization for the trace.
+        log.debug("Parameters: %r", tool_params)
+
+        if (tool_params.keys() == {"a", "b"}
+                and isinstance(tool_params["a"], (int, float))
+                and isinstance(tool_params["b"], (int, float))):
+            result = self._cached_execute(tool_id, tool_params["a"], tool_params["b"])
+        else:
+            result = self.tools[tool_id].handler(tool_params)
+        log.debug("Result: %s", result)
         return result
 
-class MCPRequestHandler(BaseHTTPRequestHandler):
-    """HTTP request handler for MCP server."""
-    
-    server_instance = MCPCalculatorServer()
-    
-    def do_POST(self):
-        """Handle POST requests."""
-        # Get content length
-        content_length = int(self.headers.get('Content-Length', 0))
-        if content_length == 0:
-            self.send_error(400, "Missing request body")
-            return
-            
-        # Read and parse request body
-        request_body = self.rfile.read(content_length).decode('utf-8')
-        try:
-            request = json.loads(request_body)
-        except json.JSONDecodeError:
-            self.send_error(400, "Invalid JSON in request body")
-            return
-            
-        # Extract request information
-        jsonrpc = request.get("jsonrpc")
-        method = request.get("method")
-        params = request.get("params", {})
-        request_id = request.get("id")
-        
-        # Log the request
-        print(f"\n[DEBUG] === NEW REQUEST ===", file=sys.stderr)
-        print(f"[DEBUG] Method: {method}", file=sys.stderr)
-        print(f"[DEBUG] ID: {request_id}", file=sys.stderr)
-        print(f"[DEBUG] Params: {json.dumps(params)}", file=sys.stderr)
-        
-        # Validate basic JSON-RPC structure
-        if jsonrpc != "2.0" or not method:
-            self.send_json_response({
-                "jsonrpc": "2.0",
-                "error": {
-                    "code": -32600,
-                    "message": "Invalid Request"
-                },
-                "id": request_id
-            })
-            return
-            
-        # Process the request
-        try:
-            result = None
-            
-            if method == "initialize":
-                result = self.server_instance.handle_initialize()
-            elif method == "tools/list":
-                result = self.server_instance.handle_list_tools()
-            elif method == "tools/execute":
-                result = self.server_instance.handle_execute_tool(params)
-            else:
-                self.send_json_response({
-                    "jsonrpc": "2.0",
-                    "error": {
-                        "code": -32601,
-                        "message": f"Method not found: {method}"
-                    },
-                    "id": request_id
-                })
-                return
-                
-            # Send success response
-            response = {
-                "jsonrpc": "2.0",
-                "result": result,
-                "id": request_id
-            }
-            self.send_json_response(response)
-            
-        except Exception as e:
-            # Send error response
-            error_message = str(e)
-            print(f"[DEBUG] Error: {error_message}", file=sys.stderr)
-            self.send_json_response({
-                "jsonrpc": "2.0",
-                "error": {
-                    "code": -32603,
-                    "message": f"Internal error: {error_message}"
-                },
-                "id": request_id
-            })
-            
-        print(f"[DEBUG] === END REQUEST ===\n", file=sys.stderr)
-            
-    def send_json_response(self, response_obj):
-        """Send a JSON response to the client."""
-        response_str = json.dumps(response_obj)
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Content-Length', str(len(response_str)))
-        self.end_headers()
-        self.wfile.write(response_str.encode('utf-8'))
-        print(f"[DEBUG] Response: {response_str}", file=sys.stderr)
-            
+    def _execute_scalar(self, tool_id, a, b):
+        """Execute a scalar two-operand tool; memoized via _cached_execute."""
+        return self.tools[tool_id].handler({"a": a, "b": b})
+
+    def handle_invalidate_cache(self):
+        """Handle a tools/invalidate request by clearing the result cache."""
+        info = self._cached_execute.cache_info()
+        self._cached_execute.cache_clear()
+        log.debug("Result cache cleared (was: %s)", info)
+        return {"invalidated": info.currsize}
+
+# Shared server state for the HTTP handler: one calculator instance and
+# a bounded worker pool so tool compute stays off the event loop.
+server_instance = MCPCalculatorServer()
+executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Preformatted JSON-RPC error envelopes. Only the id (and the message,
+# where it varies) is spliced in as pre-encoded JSON, so the error paths
+# skip dict construction and a full encoder pass.
+ERR_INVALID_REQUEST = b'{"jsonrpc":"2.0","error":{"code":-32600,"message":"Invalid Request"},"id":%s}'
+ERR_METHOD_NOT_FOUND = b'{"jsonrpc":"2.0","error":{"code":-32601,"message":%s},"id":%s}'
+ERR_INTERNAL = b'{"jsonrpc":"2.0","error":{"code":-32603,"message":%s},"id":%s}'
+
+def error_response(template, *fields):
+    """Build an aiohttp response from a preformatted error template."""
+    body = template % fields
+    log.debug("Response bytes=%d", len(body))
+    return web.Response(body=body, content_type='application/json')
+
+def json_response(response_obj):
+    """Build an aiohttp response from a JSON-RPC response object."""
+    response_bytes = json_dumps(response_obj)
+    log.debug("Response bytes=%d", len(response_bytes))
+    return web.Response(body=response_bytes, content_type='application/json')
+
+async def handle_rpc(request):
+    """Handle a JSON-RPC POST request."""
+    if request.content_length and request.content_length > MAX_BODY_BYTES:
+        return web.Response(status=413, text="Request body too large")
+
+    # Read and parse request body (bytes go straight to the parser)
+    request_body = await request.read()
+    if not request_body:
+        return web.Response(status=400, text="Missing request body")
+    try:
+        rpc_request = json_loads(request_body)
+    except ValueError:
+        return web.Response(status=400, text="Invalid JSON in request body")
+
+    # Valid JSON that is not an object (array, string, number, ...) is
+    # still not a JSON-RPC request
+    if not isinstance(rpc_request, dict):
+        return error_response(ERR_INVALID_REQUEST, b"null")
+
+    # Extract the envelope fields; params stays untouched until a
+    # handler actually needs it (initialize and tools/list ignore it)
+    jsonrpc = rpc_request.get("jsonrpc")
+    method = rpc_request.get("method")
+    request_id = rpc_request.get("id")
+
+    # Log the request, using the raw body instead of re-serializing
+    # the params we just parsed
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("=== NEW REQUEST ===")
+        log.debug("Method: %s", method)
+        log.debug("ID: %s", request_id)
+        log.debug("Body: %s", request_body)
+
+    # Validate basic JSON-RPC structure
+    if jsonrpc != "2.0" or not method:
+        return error_response(ERR_INVALID_REQUEST, json_dumps(request_id))
+
+    # Look up the method handler
+    handler = server_instance._dispatch.get(method)
+    if handler is None:
+        return error_response(ERR_METHOD_NOT_FOUND,
+                              json_dumps(f"Method not found: {method}"),
+                              json_dumps(request_id))
+
+    # Process the request
+    try:
+        if method == "tools/execute":
+            params = rpc_request.get("params", {})
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(executor, handler, params)
+        else:
+            result = handler(None)
+
+        response = json_response({
+            "jsonrpc": "2.0",
+            "result": result,
+            "id": request_id
+        })
+
+    except Exception as e:
+        error_message = str(e)
+        log.debug("Error: %s", error_message)
+        response = error_response(ERR_INTERNAL,
+                                  json_dumps(f"Internal error: {error_message}"),
+                                  json_dumps(request_id))
+
+    log.debug("=== END REQUEST ===")
+    return response
+
 def main():
     """Main entry point for the calculator server."""
-    server_address = (HOST, PORT)
-    
     print("\n========================================", file=sys.stderr)
     print(f"{SERVER_NAME} starting on http://{HOST}:{PORT}", file=sys.stderr)
     print(f"Version: {SERVER_VERSION}", file=sys.stderr)
     print("Available tools:", file=sys.stderr)
-    print("  - calculator:add - Add two numbers together", file=sys.stderr)
-    print("  - calculator:subtract - Subtract the second number from the first", file=sys.stderr)
+    for tool in server_instance.tools.values():
+        print(f"  - {tool.id} - {tool.description}", file=sys.stderr)
     print("========================================\n", file=sys.stderr)
     
+    if uvloop is not None:
+        uvloop.install()
+
+    app = web.Application()
+    app.router.add_post("/", handle_rpc)
+
     try:
-        httpd = HTTPServer(server_address, MCPRequestHandler)
         print("Server is running. Press Ctrl+C to stop.", file=sys.stderr)
-        httpd.serve_forever()
-    except KeyboardInterrupt:
-        print("\nServer shutting down...", file=sys.stderr)
-        httpd.server_close()
+        web.run_app(app, host=HOST, port=PORT, print=None, access_log=None)
         print("Server stopped.", file=sys.stderr)
     except Exception as e:
         print(f"\nError: {e}", file=sys.stderr)
@@ -7,35 +7,324 @@ It connects directly to the MCP server via HTTP,
 discovers tools, formats them for the LLM, and executes them based on LLM responses.
 """
 
+import asyncio
+import hashlib
+import itertools
 import json
+import logging
 import os
 import re
 import sys
+import time
+import traceback
 import argparse
-from typing import Any, Dict, List, Optional, Union
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 import dotenv
 import httpx
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_dumps(obj) -> bytes:
+    """Serialize an object to JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+def json_loads(data):
+    """Parse JSON from bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+def json_dumps_sorted(obj) -> str:
+    """Serialize to compact JSON text with sorted keys, so the output is
+    byte-stable for identical input."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode('utf-8')
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'))
+
+# Bounded LRU of LLM responses keyed on the request-body hash. Only
+# consulted for deterministic (temperature 0) requests, where replaying
+# an identical conversation must produce the same completion, so a hit
+# saves an entire API round-trip.
+_RESPONSE_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_RESPONSE_CACHE_MAX = 512
+
+# On-disk warm-start cache of discovered tools and the rendered system
+# prompt, keyed on the server URL; entries older than this are ignored.
+_SETUP_CACHE_MAX_AGE = 3600.0
+
+def _response_cache_get(key: str) -> Optional[str]:
+    """Look up a cached LLM response, refreshing its LRU position."""
+    try:
+        _RESPONSE_CACHE.move_to_end(key)
+    except KeyError:
+        return None
+    return _RESPONSE_CACHE[key]
+
+def _response_cache_put(key: str, value: str):
+    """Store an LLM response, evicting the oldest entries past the bound."""
+    _RESPONSE_CACHE[key] = value
+    _RESPONSE_CACHE.move_to_end(key)
+    while len(_RESPONSE_CACHE) > _RESPONSE_CACHE_MAX:
+        _RESPONSE_CACHE.popitem(last=False)
+
+# Wire-level traces are logged at DEBUG and formatted lazily, so the
+# growing conversation payload is never re-serialized when the level is
+# off. User-facing progress stays on plain print.
+logger = logging.getLogger(__name__)
+
+
+# System prompt boilerplate, compiled into the module once; only the tool
+# descriptions are substituted in (%-style, since the JSON examples are
+# full of literal braces).
+_SYSTEM_PROMPT_TEMPLATE = """You are a helpful assistant with access to the following tools:
+
+%(tools_description)s
+
+To use a tool, include a JSON block anywhere in your response like this:
+```json
+{
+  "tool": "tool_name",
+  "parameters": {
+    "param1": value1,
+    "param2": value2
+  }
+}
+```
+
+IMPORTANT RULES:
+1. You can explain your reasoning, but ALWAYS use tools for operations - NEVER perform calculations yourself
+2. You can include SEVERAL tool calls in one response when the operations are INDEPENDENT of each other - each in its own JSON block; all results will be returned together
+3. When an operation depends on a previous result, wait for the tool result before making that call
+4. After receiving tool results, ALWAYS make the next tool call if more operations remain
+5. Only provide a final answer after ALL operations have been performed using tools
+
+For multi-step tasks:
+1. First explain which step you're on and what you're doing (e.g., 'Step 1: I'll add these numbers')
+2. Then include the JSON block to call the appropriate tool
+3. For each step, explain what you're doing and why
+4. Only provide a final answer when the entire task is complete
+
+For example, to calculate '5+10-3':
+Step a: I'll add 5 and 10
+```json
+{
+  "tool": "add",
+  "parameters": {
+    "a": 5,
+    "b": 10
+  }
+}
+```
+
+After receiving result 15:
+Step b: Now I'll subtract 3 from the result 15
+```json
+{
+  "tool": "subtract",
+  "parameters": {
+    "a": 15,
+    "b": 3
+  }
+}
+```
+
+After receiving result 12:
+The result of 5+10-3 is 12.
+
+Remember to use tools for EVERY operation, no matter how simple it seems."""
+
+
+# Patterns used to find tool-call JSON in LLM responses, compiled once at
+# module load instead of per call.
+_JSON_FENCE_RE = re.compile(r"```json\n(.*?)\n```", re.DOTALL)
+_FENCE_RE = re.compile(r"```\n(.*?)\n```", re.DOTALL)
+
+
+def _extract_json_objects(text: str) -> Iterator[str]:
+    """
+    Yield each top-level {...} substring of text in a single left-to-right
+    pass, tracking brace depth and string state. Unlike a backtracking
+    balanced-brace regex this is O(n) regardless of input shape.
+
+    String state is only tracked inside braces: prose around the objects
+    may contain unbalanced quotes (inches, apostrophized quotes, ...),
+    and honoring those would swallow the next real object. A stray brace
+    inside prose quotes just yields a candidate that fails to parse,
+    which the caller skips.
+    """
+    depth = 0
+    start = 0
+    in_string = False
+    escape = False
+
+    for i, char in enumerate(text):
+        if depth == 0:
+            if char == "{":
+                start = i
+                depth = 1
+                in_string = False
+                escape = False
+        elif in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                yield text[start:i + 1]
+
 
 class LLMAgent:
     """An agent that uses an LLM to work with MCP tools."""
 
-    def __init__(self, mcp_server_url: str, api_key: str, model: str = "deepseek-chat"):
+    def __init__(self, mcp_server_url: str, api_key: str, model: str = "deepseek-chat",
+                 temperature: float = 0.7, enable_response_cache: bool = True):
         """
         Initialize the LLM agent.
-        
+
         Args:
             mcp_server_url: The URL of the MCP server
             api_key: The DeepSeek API key
             model: The DeepSeek model to use
+            temperature: The sampling temperature for the LLM
+            enable_response_cache: Reuse cached LLM responses for repeated
+                identical requests (only applies when temperature is 0)
         """
         self.mcp_server_url = mcp_server_url
         self.api_key = api_key
         self.model = model
+        self.temperature = temperature
+        self.enable_response_cache = enable_response_cache
+        # The endpoint, headers and static payload fields never change, so
+        # build them once instead of per request
+        self._llm_url = "https://api.deepseek.com/chat/completions"
+        self._llm_headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        }
+        self._base_payload = {
+            "model": model,
+            "temperature": temperature,
+            "max_tokens": 4096,
+            "stream": True
+        }
+        self._mcp_headers = {"Content-Type": "application/json"}
+        # Monotonic JSON-RPC request ids: a bare integer encodes smaller
+        # and faster than a formatted string like "exec-<tool_id>"
+        self._req_id = itertools.count(1)
+        # Warm-start cache location, keyed on the server URL; see
+        # load_setup_cache/save_setup_cache
+        self._setup_cache_path = Path(
+            "~/.cache/mcp_agent/"
+            f"{hashlib.blake2b(mcp_server_url.encode()).hexdigest()[:16]}.json"
+        ).expanduser()
+        logger.debug("API key (first 5 chars): %s...", api_key[:5])
         self.tools = []
-        self.messages = []
         self.system_prompt = ""
+        self._tool_by_name = {}
+        self._tool_names_str = ""
+        self._tools_description = ""
+        # The conversation is kept as a committed, append-only stable
+        # prefix plus an in-flight tail for the current turn. Keeping the
+        # prefix byte-stable across requests lets providers with prompt
+        # prefix caching (DeepSeek caches automatically) reuse their KV
+        # cache for everything except the tail.
+        self._stable_prefix: List[Dict[str, str]] = []
+        self._dynamic_tail: List[Dict[str, str]] = []
+        # Rough budget for the committed history; past it, old turns are
+        # compacted so request size stops growing with session length
+        self._max_history_tokens = 8000
+        # Separate pooled clients so a slow LLM endpoint can't starve the
+        # local MCP pool (or vice versa). Both keep connections alive
+        # across requests; the DeepSeek client additionally negotiates
+        # HTTP/2, so concurrent requests multiplex over one TLS session.
+        timeout = httpx.Timeout(connect=5.0, read=30.0, write=5.0, pool=5.0)
+        limits = httpx.Limits(
+            max_keepalive_connections=32,
+            max_connections=64,
+            keepalive_expiry=60.0
+        )
+        self._llm_client = httpx.AsyncClient(
+            timeout=timeout,
+            transport=httpx.AsyncHTTPTransport(
+                http2=True, limits=limits, retries=2
+            )
+        )
+        self._mcp_client = httpx.AsyncClient(
+            timeout=timeout,
+            transport=httpx.AsyncHTTPTransport(limits=limits, retries=2)
+        )
+
+    @property
+    def messages(self) -> List[Dict[str, str]]:
+        """The full conversation: committed prefix plus in-flight tail."""
+        return self._stable_prefix + self._dynamic_tail
+
+    def _commit_tail(self):
+        """Fold the in-flight tail into the stable prefix once a turn completes."""
+        self._stable_prefix.extend(self._dynamic_tail)
+        self._dynamic_tail = []
+        self._compact_history()
+
+    def _compact_history(self):
+        """
+        Keep the committed history within the token budget.
+
+        Uses a cheap len/4 token estimate. When over budget, the system
+        prompt and the most recent turns are kept verbatim and everything
+        in between is collapsed into one short summary message. Compaction
+        rewrites the prefix (and so misses the provider prompt cache once),
+        which is still far cheaper than uploading an unbounded history on
+        every subsequent turn.
+        """
+        estimated = sum(len(m["content"]) // 4 for m in self._stable_prefix)
+        if estimated <= self._max_history_tokens:
+            return
+
+        keep_recent = 6
+        if len(self._stable_prefix) <= keep_recent + 1:
+            return
+
+        system_message = self._stable_prefix[0]
+        old = self._stable_prefix[1:-keep_recent]
+        recent = self._stable_prefix[-keep_recent:]
+
+        summary_lines = []
+        for message in old:
+            content = message["content"]
+            if len(content) > 200:
+                content = content[:200] + "..."
+            summary_lines.append(f"[{message['role']}] {content}")
+        summary = {
+            "role": "system",
+            "content": ("Summary of earlier conversation (older messages "
+                        "compacted to stay within the context budget):\n"
+                        + "\n".join(summary_lines))
+        }
+
+        self._stable_prefix = [system_message, summary] + recent
+
+    async def aclose(self):
+        """Close the underlying HTTP clients and their pooled connections."""
+        await self._llm_client.aclose()
+        await self._mcp_client.aclose()
     
     async def initialize_connection(self) -> Dict[str, Any]:
         """
@@ -62,8 +351,7 @@ class LLMAgent:
                         "sampling": {},
                         "experimental": {}
                     }
-                },
-                "id": "init-1"
+                }
             }
             
             response = await self._send_mcp_request(request)
@@ -85,69 +373,32 @@ class LLMAgent:
             request = {
                 "jsonrpc": "2.0",
                 "method": "tools/list",
-                "params": {},
-                "id": "list-1"
+                "params": {}
             }
             
             self.tools = await self._send_mcp_request(request)
-            
+
+            # Index the tools by name so each tool call resolves in one
+            # dict lookup instead of a linear scan
+            self._tool_by_name = {tool["name"]: tool for tool in self.tools}
+            self._tool_names_str = ", ".join(self._tool_by_name)
+            self._tools_description = ""
+
             # Create the system prompt with tool descriptions
             tools_description = self._format_tools_for_llm()
-            self.system_prompt = (
-                "You are a helpful assistant with access to the following tools:\n\n"
-                f"{tools_description}\n\n"
-                "To use a tool, include a JSON block anywhere in your response like this:\n"
-                "```json\n"
-                "{\n"
-                '  "tool": "tool_name",\n'
-                '  "parameters": {\n'
-                '    "param1": value1,\n'
-                '    "param2": value2\n'
-                "  }\n"
-                "}\n"
-                "```\n\n"
-                "IMPORTANT RULES:\n"
-                "1. You can explain your reasoning, but ALWAYS use tools for operations - NEVER perform calculations yourself\n"
-                "2. Use ONE tool call per response\n"
-                "3. After receiving a tool result, ALWAYS make the next tool call if more operations remain\n"
-                "4. Only provide a final answer after ALL operations have been performed using tools\n\n"
-                "For multi-step tasks:\n"
-                "1. First explain which step you're on and what you're doing (e.g., 'Step 1: I'll add these numbers')\n"
-                "2. Then include the JSON block to call the appropriate tool\n"
-                "3. For each step, explain what you're doing and why\n"
-                "4. Only provide a final answer when the entire task is complete\n\n"
-                "For example, to calculate '5+10-3':\n"
-                "Step a: I'll add 5 and 10\n"
-                "```json\n"
-                "{\n"
-                '  "tool": "add",\n'
-                '  "parameters": {\n'
-                '    "a": 5,\n'
-                '    "b": 10\n'
-                "  }\n"
-                "}\n"
-                "```\n\n"
-                "After receiving result 15:\n"
-                "Step b: Now I'll subtract 3 from the result 15\n"
-                "```json\n"
-                "{\n"
-                '  "tool": "subtract",\n'
-                '  "parameters": {\n'
-                '    "a": 15,\n'
-                '    "b": 3\n'
-                "  }\n"
-                "}\n"
-                "```\n\n"
-                "After receiving result 12:\n"
-                "The result of 5+10-3 is 12.\n\n"
-                "Remember to use tools for EVERY operation, no matter how simple it seems."
-            )
-            
-            # Initialize the conversation with the system prompt
-            self.messages = [
+            self.system_prompt = _SYSTEM_PROMPT_TEMPLATE % {
+                "tools_description": tools_description
+            }
+
+
+            # Initialize the conversation with the system prompt as the
+            # first committed message of the stable prefix
+            self._stable_prefix = [
                 {"role": "system", "content": self.system_prompt}
             ]
-            
+            self._dynamic_tail = []
+
+
             return self.tools
         except Exception as e:
             print(f"Error discovering tools: {e}")
@@ -155,36 +406,89 @@ class LLMAgent:
     
     def _format_tools_for_llm(self) -> str:
         """
-        Format tools into a string description for the LLM.
-        
+        Format tools into a deterministic string description for the LLM.
+
+        Each tool's parameter schema is inlined as a sorted-keys JSON dump
+        instead of hand-rolled prose, so the rendered prompt is byte-stable
+        across runs and keeps hitting the provider's prompt prefix cache
+        after a restart. The result is cached until the tool list is
+        rediscovered.
+
         Returns:
             A formatted string describing all tools
         """
-        descriptions = []
-        
-        for tool in self.tools:
-            # Format basic tool info
-            desc = f"Tool: {tool['name']}\n"
-            desc += f"Description: {tool['description']}\n"
-            desc += "Parameters:\n"
-            
-            # Format parameters
-            if 'parameters_schema' in tool and 'properties' in tool['parameters_schema']:
-                properties = tool['parameters_schema']['properties']
-                required = tool['parameters_schema'].get('required', [])
-                
-                for param_name, param_info in properties.items():
-                    param_desc = f"  - {param_name}"
-                    if param_name in required:
-                        param_desc += " (required)"
-                    param_desc += f": {param_info.get('description', 'No description')}"
-                    param_desc += f" (type: {param_info.get('type', 'any')})"
-                    desc += param_desc + "\n"
-            
-            descriptions.append(desc)
-        
-        return "\n".join(descriptions)
-    
+        if self._tools_description:
+            return self._tools_description
+
+        self._tools_description = "\n".join(
+            f"Tool: {tool['name']}\n"
+            f"Description: {tool['description']}\n"
+            f"Schema: {json_dumps_sorted(tool.get('parameters_schema', {}))}\n"
+            for tool in self.tools
+        )
+        return self._tools_description
+
+    def load_setup_cache(self) -> Optional[Dict[str, Any]]:
+        """
+        Warm-start from the on-disk setup cache if it exists and is fresh.
+
+        Restores the discovered tools and system prompt written by a
+        previous run against the same server URL, so startup skips the
+        initialize and tools/list round-trips entirely.
+
+        Returns:
+            The cached server info on a hit, or None when the cache is
+            missing, stale or unreadable
+        """
+        path = self._setup_cache_path
+        try:
+            if time.time() - path.stat().st_mtime > _SETUP_CACHE_MAX_AGE:
+                return None
+            data = json_loads(path.read_bytes())
+            tools = data["tools"]
+            system_prompt = data["system_prompt"]
+            server_info = data["server_info"]
+            # Rebuild the index before touching any agent state, so a
+            # malformed tools list falls back to the normal handshake
+            # instead of leaving the agent half-initialized
+            tool_by_name = {tool["name"]: tool for tool in tools}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        self.tools = tools
+        self._tool_by_name = tool_by_name
+        self._tool_names_str = ", ".join(self._tool_by_name)
+        self._tools_description = ""
+        self.system_prompt = system_prompt
+        self._stable_prefix = [{"role": "system", "content": system_prompt}]
+        self._dynamic_tail = []
+        logger.debug("Warm start from %s", path)
+        return server_info
+
+    def save_setup_cache(self, server_info: Dict[str, Any]):
+        """
+        Persist the discovered tools and rendered system prompt to disk.
+
+        Written atomically (tmpfile + os.replace) so a concurrent reader
+        never sees a partial file. Failures are logged and ignored - the
+        cache is purely an optimization.
+
+        Args:
+            server_info: The initialize response to store alongside
+        """
+        path = self._setup_cache_path
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(json_dumps({
+                "tools": self.tools,
+                "system_prompt": self.system_prompt,
+                "server_info": server_info
+            }))
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.debug("Could not write setup cache %s: %s", path, e)
+
     async def process_user_input(self, user_input: str) -> str:
         """
         Process user input through the LLM and execute any requested tools.
@@ -196,83 +500,70 @@ class LLMAgent:
             The final response for the user
         """
         # Add user input to the conversation
-        self.messages.append({"role": "user", "content": user_input})
+        self._dynamic_tail.append({"role": "user", "content": user_input})
         
         # Get initial response from LLM
         return await self._process_llm_response()
     
     async def _process_llm_response(self) -> str:
         """
-        Process an LLM response, handling any tool calls and subsequent steps.
-        
+        Process LLM responses, handling tool calls until a final answer arrives.
+
+        Runs as a loop rather than recursing per tool step, so arbitrarily
+        long tool chains use constant stack depth.
+
         Returns:
             The final response for the user
         """
-        # Get response from LLM
-        llm_response = await self._get_llm_response()
-        
-        # Check if the response contains a tool call
-        tool_call = self._parse_tool_call(llm_response)
-        
-        if tool_call:
-            tool_name = tool_call.get("tool")
-            parameters = tool_call.get("parameters", {})
-            
+        while True:
+            # Get response from LLM
+            llm_response = await self._get_llm_response()
+
+            # Check if the response contains tool calls
+            tool_calls = self._parse_tool_calls(llm_response)
+
+            if not tool_calls:
+                # No tool call: add the response to history and return it
+                self._dynamic_tail.append({"role": "assistant", "content": llm_response})
+                self._commit_tail()
+                return llm_response
+
             # Add the complete LLM response to conversation history
-            self.messages.append({"role": "assistant", "content": llm_response})
-            
-            # Find the tool ID from the name
-            tool_id = None
-            for tool in self.tools:
-                if tool["name"] == tool_name:
-                    tool_id = tool["id"]
-                    break
-            
-            if tool_id:
-                try:
-                    # Execute the tool
-                    print(f"Executing tool: {tool_name} with parameters: {parameters}")
-                    result = await self._execute_tool(tool_id, parameters)
-                    
-                    # Add the tool result to the conversation
-                    # Use a format that encourages the LLM to continue its reasoning
-                    self.messages.append({"role": "system", "content": f"Tool result: {result}"})
-                    
-                    # Process next step (which might be another tool call or a final response)
-                    return await self._process_llm_response()
-                    
-                except Exception as e:
-                    error_message = f"Error executing tool: {str(e)}"
+            self._dynamic_tail.append({"role": "assistant", "content": llm_response})
+
+            tool_names = [call.get("tool") for call in tool_calls]
+            print(f"Executing {len(tool_calls)} tool call(s): {', '.join(str(n) for n in tool_names)}")
+
+            # Execute all tool calls of this turn concurrently; the MCP
+            # round-trips are I/O-bound, so N calls cost ~1 RTT instead
+            # of N. Results come back in call order.
+            results = await asyncio.gather(
+                *(self._execute_tool_call(call) for call in tool_calls),
+                return_exceptions=True
+            )
+
+            # Consolidate the results (and any errors) into one message
+            # that encourages the LLM to continue its reasoning
+            lines = []
+            for tool_name, result in zip(tool_names, results):
+                if isinstance(result, BaseException):
+                    error_message = f"Error executing tool '{tool_name}': {result}"
                     print(error_message)
-                    
-                    # Add the error to the conversation
-                    self.messages.append({"role": "system", "content": f"Error executing tool '{tool_name}': {error_message}"})
-                    
-                    # Get the final response from the LLM
-                    final_response = await self._get_llm_response()
-                    
-                    # Add the final response to conversation history
-                    self.messages.append({"role": "assistant", "content": final_response})
-                    
-                    return final_response
-            else:
-                error_message = f"Unknown tool: {tool_name}"
-                print(error_message)
-                
-                # Add the error to the conversation
-                self.messages.append({"role": "system", "content": f"Unknown tool '{tool_name}'. Available tools: {', '.join(tool['name'] for tool in self.tools)}"})
-                
-                # Get the final response from the LLM
-                final_response = await self._get_llm_response()
-                
-                # Add the final response to conversation history
-                self.messages.append({"role": "assistant", "content": final_response})
-                
-                return final_response
-        else:
-            # If no tool call, add the response to history and return it
-            self.messages.append({"role": "assistant", "content": llm_response})
-            return llm_response
+                    lines.append(error_message)
+                else:
+                    # Bound each result so a runaway tool output doesn't
+                    # inflate every subsequent request body
+                    lines.append(f"Tool result ({tool_name}): {str(result)[:2000]}")
+            self._dynamic_tail.append({"role": "system", "content": "\n".join(lines)})
+            # Loop for the next step (more tool calls or a final response)
+
+    async def _execute_tool_call(self, tool_call: Dict[str, Any]) -> Any:
+        """Resolve and execute a single parsed tool call."""
+        tool_name = tool_call.get("tool")
+        tool = self._tool_by_name.get(tool_name)
+        if tool is None:
+            raise Exception(f"Unknown tool '{tool_name}'. Available tools: {self._tool_names_str}")
+        return await self._execute_tool(tool["id"], tool_call.get("parameters", {}))
     
     async def _get_llm_response(self) -> str:
         """
@@ -284,71 +575,74 @@ class LLMAgent:
         Raises:
             Exception: If there's an error communicating with the LLM
         """
-        url = "https://api.deepseek.com/chat/completions"
-        
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}"
-        }
-        
-        payload = {
-            "model": self.model,
-            "messages": self.messages,
-            "temperature": 0.7,
-            "max_tokens": 4096
-        }
-        
-        print(f"Sending request to LLM: {json.dumps(payload, indent=2, default=str)}")
-        print(f"API Key (first 5 chars): {self.api_key[:5]}...")
-        print(f"Request URL: {url}")
-        
+        payload = {**self._base_payload, "messages": self.messages}
+
+        # Encode once and send the raw bytes, bypassing httpx's built-in
+        # encoder; the same bytes serve as the debug trace
+        body = json_dumps(payload)
+        logger.debug("Sending request to LLM: %s", body)
+
+        # For deterministic requests, an identical body must yield an
+        # identical completion, so check the response cache first
+        cache_key = None
+        if self.enable_response_cache and self.temperature == 0:
+            cache_key = hashlib.blake2b(body, digest_size=16).hexdigest()
+            cached = _response_cache_get(cache_key)
+            if cached is not None:
+                logger.debug("LLM response cache hit")
+                return cached
+
         try:
-            print("Creating httpx client...")
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                try:
-                    print("Sending POST request to LLM...")
-                    response = await client.post(url, json=payload, headers=headers)
-                    print(f"Response status code: {response.status_code}")
-                    print(f"Response headers: {response.headers}")
-                    
-                    # Try to print response body regardless of status code
-                    try:
-                        response_json = response.json()
-                        print(f"Response body: {json.dumps(response_json, indent=2)}")
-                    except Exception as e:
-                        print(f"Failed to parse response as JSON: {e}")
-                        print(f"Raw response text: {response.text}")
-                    
-                    # Now raise for non-200 status
+            # Stream the completion (SSE) instead of buffering the whole
+            # response: chunks are assembled as they arrive. The stream is
+            # always drained to the end - the system prompt invites several
+            # independent tool calls per response, so a closed tool-call
+            # fence does not mean the model is done and aborting on it
+            # would truncate multi-call responses to one call per turn
+            chunks: List[str] = []
+            async with self._llm_client.stream("POST", self._llm_url, content=body,
+                                           headers=self._llm_headers) as response:
+                logger.debug("Response status code: %s", response.status_code)
+
+                # Raise for non-200 status (read the body first so the
+                # error message can include it)
+                if response.status_code != 200:
+                    await response.aread()
                     response.raise_for_status()
-                    
-                    data = response.json()
-                    print(f"Received response from LLM: {json.dumps(data, indent=2)}")
-                    
-                    message = data.get("choices", [{}])[0].get("message", {})
-                    content = message.get("content", "")
-                    
-                    # Do NOT add to conversation history - let the caller handle it
-                    return content
-                except httpx.HTTPStatusError as e:
-                    print(f"HTTP error: {e}")
-                    print(f"Error details: {e.response.text}")
-                    raise Exception(f"LLM API error: {e.response.status_code} - {e.response.text}")
-                except httpx.RequestError as e:
-                    print(f"Request error: {e}")
-                    print(f"Error type: {type(e)}")
-                    print(f"Error details: {e.__dict__}")
-                    raise Exception(f"LLM API request failed: {str(e)}")
-                except Exception as e:
-                    print(f"Unexpected error in HTTP request: {str(e)}")
-                    print(f"Error type: {type(e)}")
-                    import traceback
-                    traceback.print_exc()
-                    raise Exception(f"Unexpected error when calling LLM API: {str(e)}")
+
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    data_str = line[6:]
+                    if data_str == "[DONE]":
+                        break
+                    try:
+                        event = json_loads(data_str)
+                    except ValueError:
+                        continue
+                    delta = event.get("choices", [{}])[0].get("delta", {})
+                    piece = delta.get("content") or ""
+                    if not piece:
+                        continue
+                    chunks.append(piece)
+
+            content = "".join(chunks)
+            logger.debug("Received %d streamed characters from LLM", len(content))
+
+            if cache_key is not None:
+                _response_cache_put(cache_key, content)
+
+            # Do NOT add to conversation history - let the caller handle it
+            return content
+        except httpx.HTTPStatusError as e:
+            print(f"HTTP error: {e}")
+            raise Exception(f"LLM API error: {e.response.status_code} - {e.response.text}")
+        except httpx.RequestError as e:
+            print(f"Request error: {e}")
+            raise Exception(f"LLM API request failed: {str(e)}")
         except Exception as e:
-            print(f"Outer exception in _get_llm_response: {str(e)}")
+            print(f"Unexpected error when calling LLM API: {str(e)}")
             print(f"Error type: {type(e)}")
-            import traceback
             traceback.print_exc()
             raise Exception(f"Failed to communicate with LLM API: {str(e)}")
     
@@ -366,19 +660,24 @@ class LLMAgent:
             Exception: If there's an error communicating with the server
         """
         try:
-            print(f"Sending request to MCP server: {json.dumps(request, indent=2)}")
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(self.mcp_server_url, json=request)
-                response.raise_for_status()
-                
-                data = response.json()
-                print(f"Received response from MCP server: {json.dumps(data, indent=2)}")
-                
-                if "error" in data:
-                    error = data["error"]
-                    raise Exception(f"MCP server error: {error.get('message')} (code: {error.get('code')})")
-                
-                return data.get("result", {})
+            if "id" not in request:
+                request["id"] = next(self._req_id)
+            body = json_dumps(request)
+            logger.debug("Sending request to MCP server: %s", body)
+            response = await self._mcp_client.post(
+                self.mcp_server_url, content=body,
+                headers=self._mcp_headers
+            )
+            response.raise_for_status()
+
+            data = json_loads(response.content)
+            logger.debug("Received response from MCP server: %s", response.content)
+
+            if "error" in data:
+                error = data["error"]
+                raise Exception(f"MCP server error: {error.get('message')} (code: {error.get('code')})")
+
+            return data.get("result", {})
         except Exception as e:
             print(f"Error communicating with MCP server: {e}")
             raise
@@ -400,76 +699,58 @@ class LLMAgent:
             "params": {
                 "tool_id": tool_id,
                 "parameters": parameters
-            },
-            "id": f"exec-{tool_id}"
+            }
         }
         
         return await self._send_mcp_request(request)
     
-    def _parse_tool_call(self, text: str) -> Optional[Dict[str, Any]]:
+    def _parse_tool_calls(self, text: str) -> List[Dict[str, Any]]:
         """
-        Parse a tool call from the LLM response.
-        
+        Parse all tool calls from the LLM response.
+
         Args:
             text: The LLM response text
-            
+
         Returns:
-            A dictionary with tool and parameters, or None if no tool call found
+            A list of dictionaries with tool and parameters, in the order
+            they appear; empty if no tool call is found
         """
-        # Method 1: Look for JSON in code blocks with json tag
-        json_matches = re.findall(r"```json\n(.*?)\n```", text, re.DOTALL)
-        for json_text in json_matches:
-            try:
-                data = json.loads(json_text)
+        # A candidate can't qualify unless both keys appear in the text
+        if '"tool"' not in text or '"parameters"' not in text:
+            return []
+
+        tool_calls = []
+
+        def collect(json_texts):
+            for json_text in json_texts:
+                try:
+                    data = json_loads(json_text)
+                except ValueError:
+                    continue
                 if isinstance(data, dict) and "tool" in data and "parameters" in data:
-                    return data
-            except json.JSONDecodeError:
-                continue
-        
+                    tool_calls.append(data)
+                elif isinstance(data, list):
+                    # A JSON array of tool calls is also accepted
+                    tool_calls.extend(
+                        item for item in data
+                        if isinstance(item, dict) and "tool" in item and "parameters" in item
+                    )
+
+        # Method 1: Look for JSON in code blocks with json tag
+        collect(_JSON_FENCE_RE.findall(text))
+        if tool_calls:
+            return tool_calls
+
         # Method 2: Look for JSON in code blocks without language tag
-        json_matches = re.findall(r"```\n(.*?)\n```", text, re.DOTALL)
-        for json_text in json_matches:
-            try:
-                data = json.loads(json_text)
-                if isinstance(data, dict) and "tool" in data and "parameters" in data:
-                    return data
-            except json.JSONDecodeError:
-                continue
-        
-        # Method 3: Check if the entire response is a JSON object
-        try:
-            data = json.loads(text)
-            if isinstance(data, dict) and "tool" in data and "parameters" in data:
-                return data
-        except json.JSONDecodeError:
-            pass
-        
-        # Method 4: Look for JSON structure with both "tool" and "parameters" keys
-        # This regex tries to find a JSON object that contains both required keys
-        json_pattern = r'\{(?:[^{}]|(?:\{(?:[^{}]|(?:\{[^{}]*\}))*\}))*"tool"\s*:\s*"[^"]*"(?:[^{}]|(?:\{(?:[^{}]|(?:\{[^{}]*\}))*\}))*"parameters"\s*:\s*\{(?:[^{}]|(?:\{(?:[^{}]|(?:\{[^{}]*\}))*\}))*\}(?:[^{}]|(?:\{(?:[^{}]|(?:\{[^{}]*\}))*\}))*\}'
-        json_matches = re.findall(json_pattern, text)
-        
-        for json_text in json_matches:
-            try:
-                data = json.loads(json_text)
-                if isinstance(data, dict) and "tool" in data and "parameters" in data:
-                    return data
-            except json.JSONDecodeError:
-                continue
-        
-        # Method 5: Last resort - try to find a simpler pattern and parse it
-        simple_pattern = r'(\{\s*"tool"\s*:\s*"[^"]+"\s*,\s*"parameters"\s*:\s*\{[^}]+\}\s*\})'
-        simple_matches = re.findall(simple_pattern, text)
-        
-        for json_text in simple_matches:
-            try:
-                data = json.loads(json_text)
-                if isinstance(data, dict) and "tool" in data and "parameters" in data:
-                    return data
-            except json.JSONDecodeError:
-                continue
-        
-        return None
+        collect(_FENCE_RE.findall(text))
+        if tool_calls:
+            return tool_calls
+
+        # Method 3: Scan for JSON objects anywhere in the text (covers a
+        # bare JSON response as well as JSON embedded in prose) with a
+        # single linear pass
+        collect(_extract_json_objects(text))
+        return tool_calls
 
 
 async def main():
@@ -479,12 +760,16 @@ async def main():
     parser.add_argument('--input', '-i', type=str, help='One-time input to process')
     parser.add_argument('--server', '-s', type=str, default="http://localhost:8000", 
                       help='MCP server URL (default: http://localhost:8000)')
-    parser.add_argument('--test-api', '-t', action='store_true', 
+    parser.add_argument('--test-api', '-t', action='store_true',
                       help='Test the DeepSeek API connection only')
+    parser.add_argument('--no-cache', action='store_true',
+                      help='Skip the on-disk warm-start cache of discovered tools')
     args = parser.parse_args()
     
-    # Load environment variables
-    dotenv.load_dotenv()
+    # Load environment variables from .env only when the key isn't
+    # already in the environment, skipping the filesystem scan otherwise
+    if not os.getenv("DEEPSEEK_API_KEY"):
+        dotenv.load_dotenv()
     
     # Get API key from environment
     api_key = os.getenv("DEEPSEEK_API_KEY")
@@ -497,19 +782,30 @@ async def main():
         await test_api_connection(api_key)
         return
     
+    agent = None
     try:
         # Initialize the agent
         print(f"Initializing LLM agent with MCP server at {args.server}")
         agent = LLMAgent(args.server, api_key)
         
-        # Initialize the connection
-        print("Connecting to MCP server...")
-        server_info = await agent.initialize_connection()
+        # Warm-start from the on-disk setup cache when possible; a fresh
+        # cache entry skips both startup round-trips to the server
+        server_info = None if args.no_cache else agent.load_setup_cache()
+        if server_info is not None:
+            tools = agent.tools
+            print("Restored server setup from the local cache")
+        else:
+            # Initialize the connection and discover tools concurrently;
+            # the two JSON-RPC requests are independent, so the startup
+            # pays one round-trip instead of two
+            print("Connecting to MCP server and discovering tools...")
+            server_info, tools = await asyncio.gather(
+                agent.initialize_connection(),
+                agent.discover_tools()
+            )
+            if not args.no_cache:
+                agent.save_setup_cache(server_info)
         print(f"Connected to server: {server_info.get('serverInfo', {}).get('name')}")
-        
-        # Discover tools
-        print("Discovering tools...")
-        tools = await agent.discover_tools()
         print(f"Discovered {len(tools)} tools")
         
         if args.input:
@@ -521,7 +817,10 @@ async def main():
             # Start interactive loop
             print("\nLLM Agent ready for interaction. Type 'exit' to quit.")
             while True:
-                user_input = input("\nYou: ").strip()
+                # Read stdin on a worker thread so the event loop (and
+                # with it the keep-alive connection pools) stays live
+                # while the user is typing
+                user_input = (await asyncio.to_thread(input, "\nYou: ")).strip()
                 if user_input.lower() in ["exit", "quit"]:
                     break
                 
@@ -532,9 +831,12 @@ async def main():
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
+    finally:
+        if agent is not None:
+            await agent.aclose()
 
 
-async def test_api_connection(api_key: str):
+async def test_api_connection(api_key: str, client: Optional[httpx.AsyncClient] = None):
     """Test the connection to the DeepSeek API."""
     print("====== TESTING DEEPSEEK API CONNECTION ======")
     url = "https://api.deepseek.com/chat/completions"
@@ -554,22 +856,27 @@ async def test_api_connection(api_key: str):
         "max_tokens": 100
     }
     
+    own_client = client is None
+    if own_client:
+        client = httpx.AsyncClient(timeout=30.0)
+
     try:
         print("Testing API connectivity...")
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            print(f"Response status: {response.status_code}")
-            
-            try:
-                data = response.json()
-                print(f"Response data: {json.dumps(data, indent=2)}")
-                print("API connection successful!")
-            except:
-                print(f"Raw response: {response.text}")
+        response = await client.post(url, json=payload, headers=headers)
+        print(f"Response status: {response.status_code}")
+
+        try:
+            data = response.json()
+            print(f"Response data: {json.dumps(data, indent=2)}")
+            print("API connection successful!")
+        except:
+            print(f"Raw response: {response.text}")
     except Exception as e:
         print(f"API test error: {str(e)}")
-        import traceback
         traceback.print_exc()
+    finally:
+        if own_client:
+            await client.aclose()
 
 
 if __name__ == "__main__":